@@ -28,28 +28,16 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+from __future__ import print_function
+
+import struct
+from array import array
 
 instruct = [""] * 256
-cycletime = [0] * 256
-extracycles = [0] * 256
+cycletime = bytearray(256)
+extracycles = bytearray(256)
 disassemble = [('???', 'imp')] * 256
 
-def make_instruction_decorator(instruct, disasm, allcycles, allextras):
-    def instruction(name, mode, cycles, extracycles=0):
-        def decorate(f):
-            opcode = int(f.__name__.split('_')[-1], 16)
-            instruct[opcode] = f
-            disasm[opcode] = (name, mode)
-            allcycles[opcode] = cycles
-            allextras[opcode] = extracycles
-            return f  # Return the original function
-        return decorate
-    return instruction
-
-instruction = make_instruction_decorator(instruct, disassemble,
-                                         cycletime, extracycles)
-
-@instruction(name="BRK", mode="imp", cycles=7)
 def inst_0x00(self):
     # pc has already been increased one
     pc = (self.pc + 1) & self.addrMask
@@ -61,735 +49,840 @@ def inst_0x00(self):
     self.p |= self.INTERRUPT
     self.pc = self.WordAt(self.IRQ)
 
-@instruction(name="ORA", mode="inx", cycles=6)
 def inst_0x01(self):
     self.opORA(self.IndirectXAddr)
     self.pc += 1
 
-@instruction(name="ORA", mode="zpg", cycles=3)
 def inst_0x05(self):
     self.opORA(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="ASL", mode="zpg", cycles=5)
 def inst_0x06(self):
     self.opASL(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="PHP", mode="imp", cycles=3)
 def inst_0x08(self):
     self.stPush(self.p | self.BREAK | self.UNUSED)
 
-@instruction(name="ORA", mode="imm", cycles=2)
 def inst_0x09(self):
     self.opORA(self.ProgramCounter)
     self.pc += 1
 
-@instruction(name="ASL", mode="acc", cycles=2)
 def inst_0x0a(self):
     self.opASL(None)
 
-@instruction(name="ORA", mode="abs", cycles=4)
 def inst_0x0d(self):
     self.opORA(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="ASL", mode="abs", cycles=6)
 def inst_0x0e(self):
     self.opASL(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="BPL", mode="rel", cycles=2, extracycles=2)
 def inst_0x10(self):
     self.opBCL(self.NEGATIVE)
 
-@instruction(name="ORA", mode="iny", cycles=5, extracycles=1)
 def inst_0x11(self):
     self.opORA(self.IndirectYAddr)
     self.pc += 1
 
-@instruction(name="ORA", mode="zpx", cycles=4)
 def inst_0x15(self):
     self.opORA(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="ASL", mode="zpx", cycles=6)
 def inst_0x16(self):
     self.opASL(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="CLC", mode="imp", cycles=2)
 def inst_0x18(self):
     self.opCLR(self.CARRY)
 
-@instruction(name="ORA", mode="aby", cycles=4, extracycles=1)
 def inst_0x19(self):
     self.opORA(self.AbsoluteYAddr)
     self.pc += 2
 
-@instruction(name="ORA", mode="abx", cycles=4, extracycles=1)
 def inst_0x1d(self):
     self.opORA(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="ASL", mode="abx", cycles=7)
 def inst_0x1e(self):
     self.opASL(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="JSR", mode="abs", cycles=6)
 def inst_0x20(self):
     self.stPushWord((self.pc + 1) & self.addrMask)
     self.pc = self.WordAt(self.pc)
 
-@instruction(name="AND", mode="inx", cycles=6)
 def inst_0x21(self):
     self.opAND(self.IndirectXAddr)
     self.pc += 1
 
-@instruction(name="BIT", mode="zpg", cycles=3)
 def inst_0x24(self):
     self.opBIT(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="AND", mode="zpg", cycles=3)
 def inst_0x25(self):
     self.opAND(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="ROL", mode="zpg", cycles=5)
 def inst_0x26(self):
     self.opROL(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="PLP", mode="imp", cycles=4)
 def inst_0x28(self):
     self.p = (self.stPop() | self.BREAK | self.UNUSED)
 
-@instruction(name="AND", mode="imm", cycles=2)
 def inst_0x29(self):
     self.opAND(self.ProgramCounter)
     self.pc += 1
 
-@instruction(name="ROL", mode="acc", cycles=2)
 def inst_0x2a(self):
     self.opROL(None)
 
-@instruction(name="BIT", mode="abs", cycles=4)
 def inst_0x2c(self):
     self.opBIT(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="AND", mode="abs", cycles=4)
 def inst_0x2d(self):
     self.opAND(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="ROL", mode="abs", cycles=6)
 def inst_0x2e(self):
     self.opROL(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="BMI", mode="rel", cycles=2, extracycles=2)
 def inst_0x30(self):
     self.opBST(self.NEGATIVE)
 
-@instruction(name="AND", mode="iny", cycles=5, extracycles=1)
 def inst_0x31(self):
     self.opAND(self.IndirectYAddr)
     self.pc += 1
 
-@instruction(name="AND", mode="zpx", cycles=4)
 def inst_0x35(self):
     self.opAND(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="ROL", mode="zpx", cycles=6)
 def inst_0x36(self):
     self.opROL(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="SEC", mode="imp", cycles=2)
 def inst_0x38(self):
     self.opSET(self.CARRY)
 
-@instruction(name="AND", mode="aby", cycles=4, extracycles=1)
 def inst_0x39(self):
     self.opAND(self.AbsoluteYAddr)
     self.pc += 2
 
-@instruction(name="AND", mode="abx", cycles=4, extracycles=1)
 def inst_0x3d(self):
     self.opAND(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="ROL", mode="abx", cycles=7)
 def inst_0x3e(self):
     self.opROL(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="RTI", mode="imp", cycles=6)
 def inst_0x40(self):
     self.p = (self.stPop() | self.BREAK | self.UNUSED)
     self.pc = self.stPopWord()
 
-@instruction(name="EOR", mode="inx", cycles=6)
 def inst_0x41(self):
     self.opEOR(self.IndirectXAddr)
     self.pc += 1
 
-@instruction(name="EOR", mode="zpg", cycles=3)
 def inst_0x45(self):
     self.opEOR(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="LSR", mode="zpg", cycles=5)
 def inst_0x46(self):
     self.opLSR(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="PHA", mode="imp", cycles=3)
 def inst_0x48(self):
     self.stPush(self.a)
 
-@instruction(name="EOR", mode="imm", cycles=2)
 def inst_0x49(self):
     self.opEOR(self.ProgramCounter)
     self.pc += 1
 
-@instruction(name="LSR", mode="acc", cycles=2)
 def inst_0x4a(self):
     self.opLSR(None)
 
-@instruction(name="JMP", mode="abs", cycles=3)
 def inst_0x4c(self):
     self.pc = self.WordAt(self.pc)
 
-@instruction(name="EOR", mode="abs", cycles=4)
 def inst_0x4d(self):
     self.opEOR(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="LSR", mode="abs", cycles=6)
 def inst_0x4e(self):
     self.opLSR(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="BVC", mode="rel", cycles=2, extracycles=2)
 def inst_0x50(self):
     self.opBCL(self.OVERFLOW)
 
-@instruction(name="EOR", mode="iny", cycles=5, extracycles=1)
 def inst_0x51(self):
     self.opEOR(self.IndirectYAddr)
     self.pc += 1
 
-@instruction(name="EOR", mode="zpx", cycles=4)
 def inst_0x55(self):
     self.opEOR(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="LSR", mode="zpx", cycles=6)
 def inst_0x56(self):
     self.opLSR(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="CLI", mode="imp", cycles=2)
 def inst_0x58(self):
     self.opCLR(self.INTERRUPT)
 
-@instruction(name="EOR", mode="aby", cycles=4, extracycles=1)
 def inst_0x59(self):
     self.opEOR(self.AbsoluteYAddr)
     self.pc += 2
 
-@instruction(name="EOR", mode="abx", cycles=4, extracycles=1)
 def inst_0x5d(self):
     self.opEOR(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="LSR", mode="abx", cycles=7)
 def inst_0x5e(self):
     self.opLSR(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="RTS", mode="imp", cycles=6)
 def inst_0x60(self):
     self.pc = self.stPopWord()
     self.pc += 1
 
-@instruction(name="ADC", mode="inx", cycles=6)
 def inst_0x61(self):
     self.opADC(self.IndirectXAddr)
     self.pc += 1
 
-@instruction(name="ADC", mode="zpg", cycles=3)
 def inst_0x65(self):
     self.opADC(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="ROR", mode="zpg", cycles=5)
 def inst_0x66(self):
     self.opROR(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="PLA", mode="imp", cycles=4)
 def inst_0x68(self):
     self.a = self.stPop()
     self.FlagsNZ(self.a)
 
-@instruction(name="ADC", mode="imm", cycles=2)
 def inst_0x69(self):
     self.opADC(self.ProgramCounter)
     self.pc += 1
 
-@instruction(name="ROR", mode="acc", cycles=2)
 def inst_0x6a(self):
     self.opROR(None)
 
-@instruction(name="JMP", mode="ind", cycles=5)
 def inst_0x6c(self):
     ta = self.WordAt(self.pc)
     self.pc = self.WrapAt(ta)
 
-@instruction(name="ADC", mode="abs", cycles=4)
 def inst_0x6d(self):
     self.opADC(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="ROR", mode="abs", cycles=6)
 def inst_0x6e(self):
     self.opROR(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="BVS", mode="rel", cycles=2, extracycles=2)
 def inst_0x70(self):
     self.opBST(self.OVERFLOW)
 
-@instruction(name="ADC", mode="iny", cycles=5, extracycles=1)
 def inst_0x71(self):
     self.opADC(self.IndirectYAddr)
     self.pc += 1
 
-@instruction(name="ADC", mode="zpx", cycles=4)
 def inst_0x75(self):
     self.opADC(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="ROR", mode="zpx", cycles=6)
 def inst_0x76(self):
     self.opROR(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="SEI", mode="imp", cycles=2)
 def inst_0x78(self):
     self.opSET(self.INTERRUPT)
 
-@instruction(name="ADC", mode="aby", cycles=4, extracycles=1)
 def inst_0x79(self):
     self.opADC(self.AbsoluteYAddr)
     self.pc += 2
 
-@instruction(name="ADC", mode="abx", cycles=4, extracycles=1)
 def inst_0x7d(self):
     self.opADC(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="ROR", mode="abx", cycles=7)
 def inst_0x7e(self):
     self.opROR(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="STA", mode="inx", cycles=6)
 def inst_0x81(self):
     self.opSTA(self.IndirectXAddr)
     self.pc += 1
 
-@instruction(name="STY", mode="zpg", cycles=3)
 def inst_0x84(self):
     self.opSTY(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="STA", mode="zpg", cycles=3)
 def inst_0x85(self):
     self.opSTA(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="STX", mode="zpg", cycles=3)
 def inst_0x86(self):
     self.opSTX(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="DEY", mode="imp", cycles=2)
 def inst_0x88(self):
     self.y -= 1
     self.y &= self.byteMask
     self.FlagsNZ(self.y)
 
-@instruction(name="TXA", mode="imp", cycles=2)
 def inst_0x8a(self):
     self.a = self.x
     self.FlagsNZ(self.a)
 
-@instruction(name="STY", mode="abs", cycles=4)
 def inst_0x8c(self):
     self.opSTY(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="STA", mode="abs", cycles=4)
 def inst_0x8d(self):
     self.opSTA(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="STX", mode="abs", cycles=4)
 def inst_0x8e(self):
     self.opSTX(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="BCC", mode="rel", cycles=2, extracycles=2)
 def inst_0x90(self):
     self.opBCL(self.CARRY)
 
-@instruction(name="STA", mode="iny", cycles=6)
 def inst_0x91(self):
     self.opSTA(self.IndirectYAddr)
     self.pc += 1
 
-@instruction(name="STY", mode="zpx", cycles=4)
 def inst_0x94(self):
     self.opSTY(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="STA", mode="zpx", cycles=4)
 def inst_0x95(self):
     self.opSTA(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="STX", mode="zpy", cycles=4)
 def inst_0x96(self):
     self.opSTX(self.ZeroPageYAddr)
     self.pc += 1
 
-@instruction(name="TYA", mode="imp", cycles=2)
 def inst_0x98(self):
     self.a = self.y
     self.FlagsNZ(self.a)
 
-@instruction(name="STA", mode="aby", cycles=5)
 def inst_0x99(self):
     self.opSTA(self.AbsoluteYAddr)
     self.pc += 2
 
-@instruction(name="TXS", mode="imp", cycles=2)
 def inst_0x9a(self):
     self.sp = self.x
 
-@instruction(name="STA", mode="abx", cycles=5)
 def inst_0x9d(self):
     self.opSTA(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="LDY", mode="imm", cycles=2)
 def inst_0xa0(self):
     self.opLDY(self.ProgramCounter)
     self.pc += 1
 
-@instruction(name="LDA", mode="inx", cycles=6)
 def inst_0xa1(self):
     self.opLDA(self.IndirectXAddr)
     self.pc += 1
 
-@instruction(name="LDX", mode="imm", cycles=2)
 def inst_0xa2(self):
     self.opLDX(self.ProgramCounter)
     self.pc += 1
 
-@instruction(name="LDY", mode="zpg", cycles=3)
 def inst_0xa4(self):
     self.opLDY(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="LDA", mode="zpg", cycles=3)
 def inst_0xa5(self):
     self.opLDA(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="LDX", mode="zpg", cycles=3)
 def inst_0xa6(self):
     self.opLDX(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="TAY", mode="imp", cycles=2)
 def inst_0xa8(self):
     self.y = self.a
     self.FlagsNZ(self.y)
 
-@instruction(name="LDA", mode="imm", cycles=2)
 def inst_0xa9(self):
     self.opLDA(self.ProgramCounter)
     self.pc += 1
 
-@instruction(name="TAX", mode="imp", cycles=2)
 def inst_0xaa(self):
     self.x = self.a
     self.FlagsNZ(self.x)
 
-@instruction(name="LDY", mode="abs", cycles=4)
 def inst_0xac(self):
     self.opLDY(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="LDA", mode="abs", cycles=4)
 def inst_0xad(self):
     self.opLDA(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="LDX", mode="abs", cycles=4)
 def inst_0xae(self):
     self.opLDX(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="BCS", mode="rel", cycles=2, extracycles=2)
 def inst_0xb0(self):
     self.opBST(self.CARRY)
 
-@instruction(name="LDA", mode="iny", cycles=5, extracycles=1)
 def inst_0xb1(self):
     self.opLDA(self.IndirectYAddr)
     self.pc += 1
 
-@instruction(name="LDY", mode="zpx", cycles=4)
 def inst_0xb4(self):
     self.opLDY(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="LDA", mode="zpx", cycles=4)
 def inst_0xb5(self):
     self.opLDA(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="LDX", mode="zpy", cycles=4)
 def inst_0xb6(self):
     self.opLDX(self.ZeroPageYAddr)
     self.pc += 1
 
-@instruction(name="CLV", mode="imp", cycles=2)
 def inst_0xb8(self):
     self.opCLR(self.OVERFLOW)
 
-@instruction(name="LDA", mode="aby", cycles=4, extracycles=1)
 def inst_0xb9(self):
     self.opLDA(self.AbsoluteYAddr)
     self.pc += 2
 
-@instruction(name="TSX", mode="imp", cycles=2)
 def inst_0xba(self):
     self.x = self.sp
     self.FlagsNZ(self.x)
 
-@instruction(name="LDY", mode="abx", cycles=4, extracycles=1)
 def inst_0xbc(self):
     self.opLDY(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="LDA", mode="abx", cycles=4, extracycles=1)
 def inst_0xbd(self):
     self.opLDA(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="LDX", mode="aby", cycles=4, extracycles=1)
 def inst_0xbe(self):
     self.opLDX(self.AbsoluteYAddr)
     self.pc += 2
 
-@instruction(name="CPY", mode="imm", cycles=2)
 def inst_0xc0(self):
     self.opCMPR(self.ProgramCounter, self.y)
     self.pc += 1
 
-@instruction(name="CMP", mode="inx", cycles=6)
 def inst_0xc1(self):
     self.opCMPR(self.IndirectXAddr, self.a)
     self.pc += 1
 
-@instruction(name="CPY", mode="zpg", cycles=3)
 def inst_0xc4(self):
     self.opCMPR(self.ZeroPageAddr, self.y)
     self.pc += 1
 
-@instruction(name="CMP", mode="zpg", cycles=3)
 def inst_0xc5(self):
     self.opCMPR(self.ZeroPageAddr, self.a)
     self.pc += 1
 
-@instruction(name="DEC", mode="zpg", cycles=5)
 def inst_0xc6(self):
     self.opDECR(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="INY", mode="imp", cycles=2)
 def inst_0xc8(self):
     self.y += 1
     self.y &= self.byteMask
     self.FlagsNZ(self.y)
 
-@instruction(name="CMP", mode="imm", cycles=2)
 def inst_0xc9(self):
     self.opCMPR(self.ProgramCounter, self.a)
     self.pc += 1
 
-@instruction(name="DEX", mode="imp", cycles=2)
 def inst_0xca(self):
     self.x -= 1
     self.x &= self.byteMask
     self.FlagsNZ(self.x)
 
-@instruction(name="CPY", mode="abs", cycles=4)
 def inst_0xcc(self):
     self.opCMPR(self.AbsoluteAddr, self.y)
     self.pc += 2
 
-@instruction(name="CMP", mode="abs", cycles=4)
 def inst_0xcd(self):
     self.opCMPR(self.AbsoluteAddr, self.a)
     self.pc += 2
 
-@instruction(name="DEC", mode="abs", cycles=3)
 def inst_0xce(self):
     self.opDECR(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="BNE", mode="rel", cycles=2, extracycles=2)
 def inst_0xd0(self):
     self.opBCL(self.ZERO)
 
-@instruction(name="CMP", mode="iny", cycles=5, extracycles=1)
 def inst_0xd1(self):
     self.opCMPR(self.IndirectYAddr, self.a)
     self.pc += 1
 
-@instruction(name="CMP", mode="zpx", cycles=4)
 def inst_0xd5(self):
     self.opCMPR(self.ZeroPageXAddr, self.a)
     self.pc += 1
 
-@instruction(name="DEC", mode="zpx", cycles=6)
 def inst_0xd6(self):
     self.opDECR(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="CLD", mode="imp", cycles=2)
 def inst_0xd8(self):
     self.opCLR(self.DECIMAL)
 
-@instruction(name="CMP", mode="aby", cycles=4, extracycles=1)
 def inst_0xd9(self):
     self.opCMPR(self.AbsoluteYAddr, self.a)
     self.pc += 2
 
-@instruction(name="CMP", mode="abx", cycles=4, extracycles=1)
 def inst_0xdd(self):
     self.opCMPR(self.AbsoluteXAddr, self.a)
     self.pc += 2
 
-@instruction(name="DEC", mode="abx", cycles=7)
 def inst_0xde(self):
     self.opDECR(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="CPX", mode="imm", cycles=2)
 def inst_0xe0(self):
     self.opCMPR(self.ProgramCounter, self.x)
     self.pc += 1
 
-@instruction(name="SBC", mode="inx", cycles=6)
 def inst_0xe1(self):
     self.opSBC(self.IndirectXAddr)
     self.pc += 1
 
-@instruction(name="CPX", mode="zpg", cycles=3)
 def inst_0xe4(self):
     self.opCMPR(self.ZeroPageAddr, self.x)
     self.pc += 1
 
-@instruction(name="SBC", mode="zpg", cycles=3)
 def inst_0xe5(self):
     self.opSBC(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="INC", mode="zpg", cycles=5)
 def inst_0xe6(self):
     self.opINCR(self.ZeroPageAddr)
     self.pc += 1
 
-@instruction(name="INX", mode="imp", cycles=2)
 def inst_0xe8(self):
     self.x += 1
     self.x &= self.byteMask
     self.FlagsNZ(self.x)
 
-@instruction(name="SBC", mode="imm", cycles=2)
 def inst_0xe9(self):
     self.opSBC(self.ProgramCounter)
     self.pc += 1
 
-@instruction(name="NOP", mode="imp", cycles=2)
 def inst_0xea(self):
     pass
 
-@instruction(name="CPX", mode="abs", cycles=4)
 def inst_0xec(self):
     self.opCMPR(self.AbsoluteAddr, self.x)
     self.pc += 2
 
-@instruction(name="SBC", mode="abs", cycles=4)
 def inst_0xed(self):
     self.opSBC(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="INC", mode="abs", cycles=6)
 def inst_0xee(self):
     self.opINCR(self.AbsoluteAddr)
     self.pc += 2
 
-@instruction(name="BEQ", mode="rel", cycles=2, extracycles=2)
 def inst_0xf0(self):
     self.opBST(self.ZERO)
 
-@instruction(name="SBC", mode="iny", cycles=5, extracycles=1)
 def inst_0xf1(self):
     self.opSBC(self.IndirectYAddr)
     self.pc += 1
 
-@instruction(name="SBC", mode="zpx", cycles=4)
 def inst_0xf5(self):
     self.opSBC(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="INC", mode="zpx", cycles=6)
 def inst_0xf6(self):
     self.opINCR(self.ZeroPageXAddr)
     self.pc += 1
 
-@instruction(name="SED", mode="imp", cycles=2)
 def inst_0xf8(self):
     self.opSET(self.DECIMAL)
 
-@instruction(name="SBC", mode="aby", cycles=4, extracycles=1)
 def inst_0xf9(self):
     self.opSBC(self.AbsoluteYAddr)
     self.pc += 2
 
-@instruction(name="SBC", mode="abx", cycles=4, extracycles=1)
 def inst_0xfd(self):
     self.opSBC(self.AbsoluteXAddr)
     self.pc += 2
 
-@instruction(name="INC", mode="abx", cycles=7)
 def inst_0xfe(self):
     self.opINCR(self.AbsoluteXAddr)
     self.pc += 2
 
-
-print cycletime
-print extracycles
\ No newline at end of file
+# Opcode, mnemonic, addressing mode, cycles, extra cycles and the handler for
+# each documented instruction, used to fill in the tables above in one pass
+_OPCODES = (
+    (0x00, "BRK", "imp", 7, 0, inst_0x00),
+    (0x01, "ORA", "inx", 6, 0, inst_0x01),
+    (0x05, "ORA", "zpg", 3, 0, inst_0x05),
+    (0x06, "ASL", "zpg", 5, 0, inst_0x06),
+    (0x08, "PHP", "imp", 3, 0, inst_0x08),
+    (0x09, "ORA", "imm", 2, 0, inst_0x09),
+    (0x0a, "ASL", "acc", 2, 0, inst_0x0a),
+    (0x0d, "ORA", "abs", 4, 0, inst_0x0d),
+    (0x0e, "ASL", "abs", 6, 0, inst_0x0e),
+    (0x10, "BPL", "rel", 2, 2, inst_0x10),
+    (0x11, "ORA", "iny", 5, 1, inst_0x11),
+    (0x15, "ORA", "zpx", 4, 0, inst_0x15),
+    (0x16, "ASL", "zpx", 6, 0, inst_0x16),
+    (0x18, "CLC", "imp", 2, 0, inst_0x18),
+    (0x19, "ORA", "aby", 4, 1, inst_0x19),
+    (0x1d, "ORA", "abx", 4, 1, inst_0x1d),
+    (0x1e, "ASL", "abx", 7, 0, inst_0x1e),
+    (0x20, "JSR", "abs", 6, 0, inst_0x20),
+    (0x21, "AND", "inx", 6, 0, inst_0x21),
+    (0x24, "BIT", "zpg", 3, 0, inst_0x24),
+    (0x25, "AND", "zpg", 3, 0, inst_0x25),
+    (0x26, "ROL", "zpg", 5, 0, inst_0x26),
+    (0x28, "PLP", "imp", 4, 0, inst_0x28),
+    (0x29, "AND", "imm", 2, 0, inst_0x29),
+    (0x2a, "ROL", "acc", 2, 0, inst_0x2a),
+    (0x2c, "BIT", "abs", 4, 0, inst_0x2c),
+    (0x2d, "AND", "abs", 4, 0, inst_0x2d),
+    (0x2e, "ROL", "abs", 6, 0, inst_0x2e),
+    (0x30, "BMI", "rel", 2, 2, inst_0x30),
+    (0x31, "AND", "iny", 5, 1, inst_0x31),
+    (0x35, "AND", "zpx", 4, 0, inst_0x35),
+    (0x36, "ROL", "zpx", 6, 0, inst_0x36),
+    (0x38, "SEC", "imp", 2, 0, inst_0x38),
+    (0x39, "AND", "aby", 4, 1, inst_0x39),
+    (0x3d, "AND", "abx", 4, 1, inst_0x3d),
+    (0x3e, "ROL", "abx", 7, 0, inst_0x3e),
+    (0x40, "RTI", "imp", 6, 0, inst_0x40),
+    (0x41, "EOR", "inx", 6, 0, inst_0x41),
+    (0x45, "EOR", "zpg", 3, 0, inst_0x45),
+    (0x46, "LSR", "zpg", 5, 0, inst_0x46),
+    (0x48, "PHA", "imp", 3, 0, inst_0x48),
+    (0x49, "EOR", "imm", 2, 0, inst_0x49),
+    (0x4a, "LSR", "acc", 2, 0, inst_0x4a),
+    (0x4c, "JMP", "abs", 3, 0, inst_0x4c),
+    (0x4d, "EOR", "abs", 4, 0, inst_0x4d),
+    (0x4e, "LSR", "abs", 6, 0, inst_0x4e),
+    (0x50, "BVC", "rel", 2, 2, inst_0x50),
+    (0x51, "EOR", "iny", 5, 1, inst_0x51),
+    (0x55, "EOR", "zpx", 4, 0, inst_0x55),
+    (0x56, "LSR", "zpx", 6, 0, inst_0x56),
+    (0x58, "CLI", "imp", 2, 0, inst_0x58),
+    (0x59, "EOR", "aby", 4, 1, inst_0x59),
+    (0x5d, "EOR", "abx", 4, 1, inst_0x5d),
+    (0x5e, "LSR", "abx", 7, 0, inst_0x5e),
+    (0x60, "RTS", "imp", 6, 0, inst_0x60),
+    (0x61, "ADC", "inx", 6, 0, inst_0x61),
+    (0x65, "ADC", "zpg", 3, 0, inst_0x65),
+    (0x66, "ROR", "zpg", 5, 0, inst_0x66),
+    (0x68, "PLA", "imp", 4, 0, inst_0x68),
+    (0x69, "ADC", "imm", 2, 0, inst_0x69),
+    (0x6a, "ROR", "acc", 2, 0, inst_0x6a),
+    (0x6c, "JMP", "ind", 5, 0, inst_0x6c),
+    (0x6d, "ADC", "abs", 4, 0, inst_0x6d),
+    (0x6e, "ROR", "abs", 6, 0, inst_0x6e),
+    (0x70, "BVS", "rel", 2, 2, inst_0x70),
+    (0x71, "ADC", "iny", 5, 1, inst_0x71),
+    (0x75, "ADC", "zpx", 4, 0, inst_0x75),
+    (0x76, "ROR", "zpx", 6, 0, inst_0x76),
+    (0x78, "SEI", "imp", 2, 0, inst_0x78),
+    (0x79, "ADC", "aby", 4, 1, inst_0x79),
+    (0x7d, "ADC", "abx", 4, 1, inst_0x7d),
+    (0x7e, "ROR", "abx", 7, 0, inst_0x7e),
+    (0x81, "STA", "inx", 6, 0, inst_0x81),
+    (0x84, "STY", "zpg", 3, 0, inst_0x84),
+    (0x85, "STA", "zpg", 3, 0, inst_0x85),
+    (0x86, "STX", "zpg", 3, 0, inst_0x86),
+    (0x88, "DEY", "imp", 2, 0, inst_0x88),
+    (0x8a, "TXA", "imp", 2, 0, inst_0x8a),
+    (0x8c, "STY", "abs", 4, 0, inst_0x8c),
+    (0x8d, "STA", "abs", 4, 0, inst_0x8d),
+    (0x8e, "STX", "abs", 4, 0, inst_0x8e),
+    (0x90, "BCC", "rel", 2, 2, inst_0x90),
+    (0x91, "STA", "iny", 6, 0, inst_0x91),
+    (0x94, "STY", "zpx", 4, 0, inst_0x94),
+    (0x95, "STA", "zpx", 4, 0, inst_0x95),
+    (0x96, "STX", "zpy", 4, 0, inst_0x96),
+    (0x98, "TYA", "imp", 2, 0, inst_0x98),
+    (0x99, "STA", "aby", 5, 0, inst_0x99),
+    (0x9a, "TXS", "imp", 2, 0, inst_0x9a),
+    (0x9d, "STA", "abx", 5, 0, inst_0x9d),
+    (0xa0, "LDY", "imm", 2, 0, inst_0xa0),
+    (0xa1, "LDA", "inx", 6, 0, inst_0xa1),
+    (0xa2, "LDX", "imm", 2, 0, inst_0xa2),
+    (0xa4, "LDY", "zpg", 3, 0, inst_0xa4),
+    (0xa5, "LDA", "zpg", 3, 0, inst_0xa5),
+    (0xa6, "LDX", "zpg", 3, 0, inst_0xa6),
+    (0xa8, "TAY", "imp", 2, 0, inst_0xa8),
+    (0xa9, "LDA", "imm", 2, 0, inst_0xa9),
+    (0xaa, "TAX", "imp", 2, 0, inst_0xaa),
+    (0xac, "LDY", "abs", 4, 0, inst_0xac),
+    (0xad, "LDA", "abs", 4, 0, inst_0xad),
+    (0xae, "LDX", "abs", 4, 0, inst_0xae),
+    (0xb0, "BCS", "rel", 2, 2, inst_0xb0),
+    (0xb1, "LDA", "iny", 5, 1, inst_0xb1),
+    (0xb4, "LDY", "zpx", 4, 0, inst_0xb4),
+    (0xb5, "LDA", "zpx", 4, 0, inst_0xb5),
+    (0xb6, "LDX", "zpy", 4, 0, inst_0xb6),
+    (0xb8, "CLV", "imp", 2, 0, inst_0xb8),
+    (0xb9, "LDA", "aby", 4, 1, inst_0xb9),
+    (0xba, "TSX", "imp", 2, 0, inst_0xba),
+    (0xbc, "LDY", "abx", 4, 1, inst_0xbc),
+    (0xbd, "LDA", "abx", 4, 1, inst_0xbd),
+    (0xbe, "LDX", "aby", 4, 1, inst_0xbe),
+    (0xc0, "CPY", "imm", 2, 0, inst_0xc0),
+    (0xc1, "CMP", "inx", 6, 0, inst_0xc1),
+    (0xc4, "CPY", "zpg", 3, 0, inst_0xc4),
+    (0xc5, "CMP", "zpg", 3, 0, inst_0xc5),
+    (0xc6, "DEC", "zpg", 5, 0, inst_0xc6),
+    (0xc8, "INY", "imp", 2, 0, inst_0xc8),
+    (0xc9, "CMP", "imm", 2, 0, inst_0xc9),
+    (0xca, "DEX", "imp", 2, 0, inst_0xca),
+    (0xcc, "CPY", "abs", 4, 0, inst_0xcc),
+    (0xcd, "CMP", "abs", 4, 0, inst_0xcd),
+    (0xce, "DEC", "abs", 3, 0, inst_0xce),
+    (0xd0, "BNE", "rel", 2, 2, inst_0xd0),
+    (0xd1, "CMP", "iny", 5, 1, inst_0xd1),
+    (0xd5, "CMP", "zpx", 4, 0, inst_0xd5),
+    (0xd6, "DEC", "zpx", 6, 0, inst_0xd6),
+    (0xd8, "CLD", "imp", 2, 0, inst_0xd8),
+    (0xd9, "CMP", "aby", 4, 1, inst_0xd9),
+    (0xdd, "CMP", "abx", 4, 1, inst_0xdd),
+    (0xde, "DEC", "abx", 7, 0, inst_0xde),
+    (0xe0, "CPX", "imm", 2, 0, inst_0xe0),
+    (0xe1, "SBC", "inx", 6, 0, inst_0xe1),
+    (0xe4, "CPX", "zpg", 3, 0, inst_0xe4),
+    (0xe5, "SBC", "zpg", 3, 0, inst_0xe5),
+    (0xe6, "INC", "zpg", 5, 0, inst_0xe6),
+    (0xe8, "INX", "imp", 2, 0, inst_0xe8),
+    (0xe9, "SBC", "imm", 2, 0, inst_0xe9),
+    (0xea, "NOP", "imp", 2, 0, inst_0xea),
+    (0xec, "CPX", "abs", 4, 0, inst_0xec),
+    (0xed, "SBC", "abs", 4, 0, inst_0xed),
+    (0xee, "INC", "abs", 6, 0, inst_0xee),
+    (0xf0, "BEQ", "rel", 2, 2, inst_0xf0),
+    (0xf1, "SBC", "iny", 5, 1, inst_0xf1),
+    (0xf5, "SBC", "zpx", 4, 0, inst_0xf5),
+    (0xf6, "INC", "zpx", 6, 0, inst_0xf6),
+    (0xf8, "SED", "imp", 2, 0, inst_0xf8),
+    (0xf9, "SBC", "aby", 4, 1, inst_0xf9),
+    (0xfd, "SBC", "abx", 4, 1, inst_0xfd),
+    (0xfe, "INC", "abx", 7, 0, inst_0xfe),
+)
+
+# String tables for the indexes stored in opinfo; index 0 of each matches the
+# ('???', 'imp') entry used for undefined opcodes
+MNEMONICS = ('???',) + tuple(sorted(set(op[1] for op in _OPCODES)))
+MODES = ('imp', 'acc', 'imm', 'zpg', 'zpx', 'zpy', 'abs', 'abx', 'aby', 'ind',
+         'inx', 'iny', 'rel')
+
+# Instruction length in bytes, including the opcode, for each addressing mode
+MODE_SIZES = {
+    'imp': 1, 'acc': 1,
+    'imm': 2, 'zpg': 2, 'zpx': 2, 'zpy': 2, 'inx': 2, 'iny': 2, 'rel': 2,
+    'abs': 3, 'abx': 3, 'aby': 3, 'ind': 3,
+}
+
+# Number of operand bytes following each opcode, i.e. how far the pc moves
+# past the operand, so a bulk walk over a program can step with a table lookup
+pc_inc = bytearray(256)
+
+# Control flow classification of each opcode as a bitmask, so finding basic
+# block boundaries is an AND rather than a comparison against mnemonic names
+CF_BRANCH = 0x01
+CF_JUMP = 0x02
+CF_CALL = 0x04
+CF_RETURN = 0x08
+CF_PAGE_CROSS = 0x10
+cfflags = bytearray(256)
+
+def control_flow_flags(name, mode, extras):
+    """Return the CF_* bits for an instruction"""
+    flags = 0
+    if mode == 'rel':
+        flags |= CF_BRANCH
+    elif extras:
+        flags |= CF_PAGE_CROSS
+    if name == 'JMP':
+        flags |= CF_JUMP
+    elif name == 'JSR':
+        flags |= CF_CALL
+    elif name in ('RTS', 'RTI', 'BRK'):
+        flags |= CF_RETURN
+    return flags
+
+# All the metadata for an opcode packed into one 4 byte record (cycles, extra
+# cycles, index into MODES, index into MNEMONICS) so the whole table is 1KiB
+opinfo = bytearray(256 * 4)
+
+# Cycles in the low nibble and the maximum extra cycles in the high nibble, so
+# the count for an instruction needs no branches: with taken and crossed as 0
+# or 1 for a taken branch and a page crossing,
+#   total = (p & 0x0f) + min(p >> 4, taken + crossed)
+packedcycles = bytearray(256)
+
+for opcode, name, mode, cycles, extras, f in _OPCODES:
+    instruct[opcode] = f
+    disassemble[opcode] = (name, mode)
+    cycletime[opcode] = cycles
+    extracycles[opcode] = extras
+    opinfo[opcode * 4:opcode * 4 + 4] = bytearray((cycles, extras,
+        MODES.index(mode), MNEMONICS.index(name)))
+    packedcycles[opcode] = (extras << 4) | cycles
+    pc_inc[opcode] = MODE_SIZES[mode] - 1
+    cfflags[opcode] = control_flow_flags(name, mode, extras)
+
+# The decoded form of each opcode as a little-endian 16 bit word, compact
+# enough to cache a whole disassembled address space:
+#   mnemonic index << 10 | mode index << 6 | cycles << 3 | extra cycles
+decoded = struct.pack('<256H', *[(opinfo[i + 3] << 10) | (opinfo[i + 2] << 6) |
+                                 (opinfo[i] << 3) | opinfo[i + 1]
+                                 for i in range(0, 256 * 4, 4)])
+
+# Contiguous uint8 copies of the cycle tables, so consumers can gather the
+# counts for a whole block of opcodes at once instead of indexing the lists
+# one opcode at a time, e.g. numpy.frombuffer(CYCLES, numpy.uint8)[ops].sum()
+CYCLES = array('B', cycletime)
+EXTRAS = array('B', extracycles)
+
+
+def emit_c_header(path):
+    """Write the cycle tables as C arrays so a C consumer can compile them in
+    rather than importing this module at startup
+    """
+    with open(path, 'w') as f:
+        f.write("#include <stdint.h>\n\n")
+        for name, table in (("cycletime", cycletime),
+                            ("extracycles", extracycles)):
+            f.write("static const uint8_t %s[256] = {\n" % name)
+            for i in range(0, 256, 16):
+                f.write("    %s,\n" % ", ".join(str(c) for c in table[i:i + 16]))
+            f.write("};\n")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--header", help="Write the cycle tables to the named C header file instead of printing them")
+    options, extra = parser.parse_known_args()
+
+    if options.header:
+        emit_c_header(options.header)
+    else:
+        print(list(cycletime))
+        print(list(extracycles))
@@ -10,9 +10,12 @@ Licensed under the Apache License 2.0
 """
 from __future__ import print_function
 
+import bisect
+import csv
 import os
 import re
-from collections import defaultdict
+import sys
+from array import array
 
 try:
     import cputables
@@ -29,8 +32,8 @@ logging.basicConfig(level=logging.WARNING)
 log = logging.getLogger(__name__)
 
 
-instruction_details = {
-    "6502": {
+def instruction_details_6502():
+    return {
         'order': [
             'accumulator',
             'implicit',
@@ -62,9 +65,9 @@ instruction_details = {
             'relative': '',
             },
 
-        # generated from py65
-        'cycles': [7, 6, 0, 0, 0, 3, 5, 0, 3, 2, 2, 0, 0, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 6, 6, 0, 0, 3, 3, 5, 0, 4, 2, 2, 0, 4, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 6, 6, 0, 0, 0, 3, 5, 0, 3, 2, 2, 0, 3, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 6, 6, 0, 0, 0, 3, 5, 0, 4, 2, 2, 0, 5, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 0, 6, 0, 0, 3, 3, 3, 0, 2, 0, 2, 0, 4, 4, 4, 0, 2, 6, 0, 0, 4, 4, 4, 0, 2, 5, 2, 0, 0, 5, 0, 0, 2, 6, 2, 0, 3, 3, 3, 0, 2, 2, 2, 0, 4, 4, 4, 0, 2, 5, 0, 0, 4, 4, 4, 0, 2, 4, 2, 0, 4, 4, 4, 0, 2, 6, 0, 0, 3, 3, 5, 0, 2, 2, 2, 0, 4, 4, 3, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 2, 6, 0, 0, 3, 3, 5, 0, 2, 2, 2, 0, 4, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0],
-        'extra_cycles': [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0],
+        # generated from py65, stored as unsigned bytes
+        'cycles': array('B', [7, 6, 0, 0, 0, 3, 5, 0, 3, 2, 2, 0, 0, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 6, 6, 0, 0, 3, 3, 5, 0, 4, 2, 2, 0, 4, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 6, 6, 0, 0, 0, 3, 5, 0, 3, 2, 2, 0, 3, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 6, 6, 0, 0, 0, 3, 5, 0, 4, 2, 2, 0, 5, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 0, 6, 0, 0, 3, 3, 3, 0, 2, 0, 2, 0, 4, 4, 4, 0, 2, 6, 0, 0, 4, 4, 4, 0, 2, 5, 2, 0, 0, 5, 0, 0, 2, 6, 2, 0, 3, 3, 3, 0, 2, 2, 2, 0, 4, 4, 4, 0, 2, 5, 0, 0, 4, 4, 4, 0, 2, 4, 2, 0, 4, 4, 4, 0, 2, 6, 0, 0, 3, 3, 5, 0, 2, 2, 2, 0, 4, 4, 3, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0, 2, 6, 0, 0, 3, 3, 5, 0, 2, 2, 2, 0, 4, 4, 6, 0, 2, 5, 0, 0, 0, 4, 6, 0, 2, 4, 0, 0, 0, 4, 7, 0]),
+        'extra_cycles': array('B', [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0]),
         'status_byte_header': "N,V,-,B,D,I,Z,C",
         'status_byte_empty': ",,,,,,,",
         'status_byte': {
@@ -117,56 +120,129 @@ instruction_details = {
 "TXS": " , , , , , , , ",
 "TYA": "N, , , , , ,Z, ",
         },
-    },
+    }
+
+
+# Functions that build the tables for each CPU, called only for the CPU that
+# is actually used
+instruction_builders = {
+    "6502": instruction_details_6502,
 }
 
+_instruction_details = {}
+
+
+class StatusFields(dict):
+    """Status byte columns for each mnemonic, already split into csv fields.
+    Mnemonics without an entry get the empty columns.
+    """
+    def __init__(self, status_byte, empty):
+        dict.__init__(self, ((m, tuple(sb.split(","))) for m, sb in status_byte.items()))
+        self.empty = tuple(empty.split(","))
+
+    def __missing__(self, mnemonic):
+        return self.empty
+
+
+def get_instruction_details(cpu_name):
+    """Return the tables for the CPU, building them on first use"""
+    try:
+        details = _instruction_details[cpu_name]
+    except KeyError:
+        details = instruction_builders[cpu_name]()
+        details['status_fields'] = StatusFields(details['status_byte'], details['status_byte_empty'])
+        _instruction_details[cpu_name] = details
+    return details
+
+
+_opcode_cells = {}
+
+def get_opcode_cells(cpu_name):
+    """Return the csv fields for every opcode of the CPU, indexed by opcode:
+    the opcode value, the cycle count (with a + if there can be extra cycles),
+    the number of bytes and an empty trailing column. Opcodes not in the CPU's
+    opcode table are None.
+    """
+    try:
+        return _opcode_cells[cpu_name]
+    except KeyError:
+        pass
+    lookup = get_instruction_details(cpu_name)
+    cycles = lookup['cycles']
+    extra_cycles = lookup['extra_cycles']
+
+    # Marker appended to the cycle count when there can be extra cycles
+    plus = ["+" if x > 0 else "" for x in extra_cycles]
+
+    cells = [None] * len(cycles)
+    for opcode, optable in cputables.processors[cpu_name]['opcodeTable'].items():
+        cells[opcode] = ("%02x" % opcode, "%d%s" % (cycles[opcode], plus[opcode]), optable[0], "")
+    cells = tuple(cells)
+    _opcode_cells[cpu_name] = cells
+    return cells
+
 
 def gen_csv(cpu_name, allow_undocumented=False):
     cpu = cputables.processors[cpu_name]
-    lookup = instruction_details[cpu_name]
+    lookup = get_instruction_details(cpu_name)
 
     # Create the opcode lookup table keyed on opcode name, each entry
     # containing a dict for each addressing mode. The entries in that second
-    # level dict contain the csv string including opcode value and the number
+    # level dict contain the csv fields including opcode value and the number
     # of bytes.
     #
     # d['ora'] = {
-    #     'immediate': '$9,?,2',
-    #     'inderectx': '$1,?,2',
+    #     'immediate': ('09', '2', 2, ''),
+    #     'inderectx': ('01', '6', 2, ''),
     #       ...
     # }
-    d = defaultdict(dict)
+    d = {}
+    mnemonics = []  # keys of d, kept sorted as they are added
     table = cpu['opcodeTable']
+    cells = get_opcode_cells(cpu_name)
+    debug_on = log.isEnabledFor(logging.DEBUG)
     for opcode, optable in table.items():
-        try:
+        if len(optable) == 4:
             num_bytes, mnemonic, mode_name, flag = optable
-        except ValueError:
+        else:
             num_bytes, mnemonic, mode_name = optable
             flag = 0
-        log.debug("%x: %s %s %d bytes, %x" % (opcode, mnemonic, mode_name, num_bytes, flag))
+        if debug_on:
+            log.debug("%x: %s %s %d bytes, %x" % (opcode, mnemonic, mode_name, num_bytes, flag))
         if allow_undocumented or not flag & flag_undoc:
-            d[mnemonic.upper()][mode_name] = "%02x,%d%s,%d," % (opcode, lookup['cycles'][opcode], "+" if lookup['extra_cycles'][opcode] > 0 else "", num_bytes)
-        else:
+            mnemonic = mnemonic.upper()
+            if mnemonic not in d:
+                d[mnemonic] = {}
+                bisect.insort(mnemonics, mnemonic)
+            d[mnemonic][mode_name] = cells[opcode]
+        elif debug_on:
             log.debug("Skipping %s %s" % (opcode, mnemonic))
 
-    create_csv(d, lookup)
+    create_csv(d, lookup, mnemonics)
 
-def create_csv(d, lookup):
-    list_csv = []
+def create_csv(d, lookup, mnemonics=None):
     list_header = "Inst,%s,Op,Cyc,B" % lookup['status_byte_header']
+    order = lookup['order']
+    status_fields = lookup['status_fields']
+    writer = csv.writer(sys.stdout, lineterminator="\n")
 
-    for mnemonic in sorted(d.keys()):
-        mode_info = d[mnemonic]
-        for mode_name in lookup['order']:
-            if mode_name in mode_info:
-                list_csv.append("\"%s %s\",%s,%s" % (mnemonic, lookup['operands'][mode_name], lookup['status_byte'].get(mnemonic, lookup['status_byte_empty']),mode_info[mode_name]))
+    # Label format for each addressing mode with the operand already filled in
+    label_format = {m: "%%s %s" % operands for m, operands in lookup['operands'].items()}
+    order_index = {m: i for i, m in enumerate(order)}
 
-    print ("\n".join(list_csv))
+    if mnemonics is None:
+        mnemonics = sorted(d.keys())
+
+    for mnemonic in mnemonics:
+        mode_info = d[mnemonic]
+        sb = status_fields[mnemonic]
+        # only visit the modes this mnemonic has, in the display order
+        for mode_name in sorted(mode_info, key=order_index.get):
+            writer.writerow((label_format[mode_name] % mnemonic,) + sb + mode_info[mode_name])
 
 
 
 if __name__ == "__main__":
-    import sys
     import argparse
     
     parser = argparse.ArgumentParser()